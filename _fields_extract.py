@@ -0,0 +1,45 @@
+"""
+Field-type extraction for sampled _source documents.
+
+Lives in its own fully-annotated module so it can be compiled as-is with
+mypyc (``mypyc _fields_extract.py``) or Cython for a C-speed drop-in —
+the function is pure (no I/O, no mutable module state) and type-complete. The
+interpreted version remains the default; nothing in the server depends
+on the compiled form.
+"""
+
+from collections import deque
+from typing import Any
+
+# Leaf-type names, precomputed. JSON-decoded values are always exact
+# dict/list/str/int/float/bool/None, so `type(x) is dict` (one pointer
+# compare) replaces isinstance's MRO walk throughout.
+_TYPE_NAME: dict[type, str] = {
+    str: "str",
+    int: "int",
+    float: "float",
+    bool: "bool",
+    type(None): "NoneType",
+}
+
+
+def extract_fields(sample: dict[str, Any]) -> dict[str, str]:
+    """Flatten a sampled _source doc into {dotted.field.path: type_name}.
+
+    Iterative (explicit work queue) rather than recursive: deeply nested
+    documents don't burn a Python frame per level.
+    """
+    fields: dict[str, str] = {}
+    stack: deque[tuple[str, dict[str, Any]]] = deque([("", sample)])
+    while stack:
+        prefix, obj = stack.pop()
+        for key, value in obj.items():
+            full_key = f"{prefix}.{key}" if prefix else key
+            t = type(value)
+            if t is dict:
+                stack.append((full_key, value))
+            elif t is list:
+                fields[full_key] = f"list ({type(value[0]).__name__ if value else 'empty'})"
+            else:
+                fields[full_key] = _TYPE_NAME.get(t, t.__name__)
+    return fields
@@ -1,16 +1,29 @@
 """
 Shared cluster registry for OpenSearch MCP tools.
 
-Maps cluster short names to (url, description) tuples.
+Maps cluster short names to ClusterInfo records (url, desc, env).
 Imported by both server.py and get-cookies.py.
 
 IMPORTANT: This file contains SAMPLE data for public repository.
 """
 
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Optional
+
+
+@dataclass(frozen=True, slots=True)
+class ClusterInfo:
+    """One registry entry. url=None means no OpenSearch for that cluster."""
+    url: Optional[str]
+    desc: str
+    env: str  # "dev" / "stg" / "prod", derived once from the short name
+
+
 # Mapping: short_name -> (url_or_None, description)
 # url=None means no OpenSearch for that cluster.
 
-CLUSTERS = {
+_RAW_CLUSTERS = {
     # ── Development ──
     "dev-aws-eu-cluster":       ("https://opensearch-dashboard.dev.example.com", "Dev AWS EU Cluster"),
     "dev-azure-us-cluster":     ("https://opensearch-dashboard.dev-us.example.com", "Dev Azure US Cluster"),
@@ -27,3 +40,19 @@ CLUSTERS = {
     # ── Example: No OpenSearch (alternative logging) ──
     "prod-special-cluster":     (None, "Prod Special Cluster — No OpenSearch (uses alternative logging solution)"),
 }
+
+# Built once at import time so consumers never re-derive the env prefix.
+CLUSTERS = {
+    name: ClusterInfo(url, desc, name.split("-")[0])
+    for name, (url, desc) in _RAW_CLUSTERS.items()
+}
+
+# Grouped view for listings: env -> [(short_name, ClusterInfo), ...]
+CLUSTERS_BY_ENV: dict[str, list[tuple[str, ClusterInfo]]] = {}
+for _name, _cluster in CLUSTERS.items():
+    CLUSTERS_BY_ENV.setdefault(_cluster.env, []).append((_name, _cluster))
+
+# Derived view, built once. The registry is frozen behind MappingProxyType
+# so consumers can cache lookups without worrying about runtime mutation.
+ACTIVE_CLUSTERS = MappingProxyType({name: c for name, c in CLUSTERS.items() if c.url})
+CLUSTERS = MappingProxyType(CLUSTERS)
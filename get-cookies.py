@@ -17,26 +17,163 @@ Examples:
 
 import argparse
 import json
+import socket
 import sys
 import os
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from playwright.sync_api import sync_playwright
 
-from clusters import CLUSTERS
+from clusters import CLUSTERS, CLUSTERS_BY_ENV
 
-# Cookies we need from the OpenSearch Dashboards session
-REQUIRED_COOKIES = ["security_authentication", "security_authentication_oidc1"]
+# orjson serialises ~5-10x faster than stdlib json and emits a single bytes
+# buffer (one write syscall); fall back to stdlib when it isn't installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# Path to the project .mcp.json
-MCP_JSON_PATH = Path(__file__).parent / ".mcp.json"
+# Playwright is imported lazily inside the functions that drive a browser —
+# its import costs tens to hundreds of ms that --list and argument-error
+# paths should not pay.
+
+
+def _dumps_json(obj) -> bytes:
+    """Serialise obj to indented JSON bytes with a trailing newline."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, indent=2).encode() + b"\n"
+
+
+def _loads_json(data: bytes):
+    """Parse JSON bytes with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Cookies we need from the OpenSearch Dashboards session (frozenset: O(1)
+# membership tests in the scan loop)
+REQUIRED_COOKIES = frozenset(("security_authentication", "security_authentication_oidc1"))
+
+# JS predicate that becomes true once both required cookies are visible
+COOKIE_JS_PREDICATE = "() => " + " && ".join(
+    f"document.cookie.includes({json.dumps(name)})" for name in sorted(REQUIRED_COOKIES)
+)
+
+# Project paths, computed once at import instead of per call
+_HERE = Path(__file__).parent
+MCP_JSON_PATH = _HERE / ".mcp.json"
+COOKIES_JSON_PATH = _HERE / "cookies.json"
+VENV_PYTHON = str(_HERE / "venv" / "bin" / "python")
+SERVER_PY = str(_HERE / "server.py")
 
 # Playwright user data dir for persistent browser context (keeps Azure AD session)
-BROWSER_DATA_DIR = Path(__file__).parent / ".browser-data"
+BROWSER_DATA_DIR = _HERE / ".browser-data"
+
+# Prebuilt for error messages: the clusters that actually have OpenSearch
+AVAILABLE_CLUSTERS = ", ".join(k for k, c in CLUSTERS.items() if c.url)
+
+# Chromium flags that skip work we never need just to collect two cookies
+CHROMIUM_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--blink-settings=imagesEnabled=false",
+]
+
+# Resource types that are pure rendering weight — the OIDC redirect chain
+# only needs HTML/JS/XHR, so everything else is aborted at the network layer.
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+
+def _block_heavy_resources(route):
+    """Playwright route handler: abort requests for render-only resources."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _collect_cookies(context, url: str, timeout: int = 60) -> dict:
+    """Drive one page through SSO in an existing context and return the cookies.
+
+    Works for both the one-shot CLI path and the warm daemon context.
+    Returns a dict of the REQUIRED_COOKIES that were found (may be partial).
+    """
+    page = context.new_page()
+    page.route("**/*", _block_heavy_resources)
+    # One raw CDP session reused for cookie reads — Network.getCookies on the
+    # session skips the per-call setup of context.cookies().
+    cdp = context.new_cdp_session(page)
+
+    def _scan_cookies() -> dict:
+        """Single cookie scan (one CDP round-trip instead of one per poll)."""
+        found = {}
+        for c in cdp.send("Network.getCookies", {"urls": [url]})["cookies"]:
+            if c["name"] in REQUIRED_COOKIES:
+                found[c["name"]] = c["value"]
+                if found.keys() >= REQUIRED_COOKIES:
+                    break  # everything we need — skip the remaining cookies
+        return found
+
+    # Cap every wait in this context at the caller's budget so a stalled SSO
+    # can never hang past `timeout` seconds in total. (No pre-navigation
+    # cookie scan here: this script mostly runs *because* the cookies in
+    # the jar just got a 401, so they must be re-minted, not re-read.)
+    deadline = time.monotonic() + timeout
+    context.set_default_timeout(timeout * 1000)
+    print(f"Opening {url} ...")
+
+    # Kick off navigation without waiting for the document to load — the
+    # browser races through the OIDC redirect chain while we wait on the
+    # Set-Cookie below, which is the real synchronisation point.
+    context.set_default_navigation_timeout(1)
+
+    # The tightest signal is the OIDC callback's Set-Cookie on the final
+    # redirect — it lands long before the dashboard SPA finishes booting,
+    # and it also catches HttpOnly cookies that document.cookie never sees.
+    # The listener is entered before goto so a Set-Cookie delivered during
+    # the early redirect chain isn't missed.
+    print("Waiting for SSO to complete ...")
+    try:
+        with page.expect_response(
+            lambda r: "security_authentication" in r.headers.get("set-cookie", ""),
+            timeout=timeout * 1000,
+        ):
+            try:
+                page.goto(url)
+            except Exception:
+                pass  # navigation "timeout" is expected; SSO continues in the background
+    except Exception:
+        # No fresh Set-Cookie observed — fall back to the in-page cookie
+        # predicate for a short window, bounded by the remaining budget so
+        # the total wait never exceeds `timeout`.
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            try:
+                # polling=100 runs inside the page (no Python<->CDP round-trip
+                # per tick) and front-loads responsiveness: most cookies appear
+                # within the first second when the SSO session is still cached.
+                page.wait_for_function(
+                    COOKIE_JS_PREDICATE,
+                    timeout=min(remaining, 10) * 1000,
+                    polling=100,
+                )
+            except Exception:
+                pass
+
+    cookies = _scan_cookies()
+    cdp.detach()
+    page.close()
+    return cookies
 
 
 def fetch_cookies(url: str, headless: bool = False, timeout: int = 60) -> str:
     """Open the dashboard URL in a browser, wait for SSO, return cookie string."""
+    from playwright.sync_api import sync_playwright
+
     with sync_playwright() as p:
         # Use persistent context so Azure AD session is cached across runs.
         # After the first manual login, subsequent runs will auto-SSO.
@@ -44,32 +181,12 @@ def fetch_cookies(url: str, headless: bool = False, timeout: int = 60) -> str:
             str(BROWSER_DATA_DIR),
             headless=headless,
             accept_downloads=False,
+            args=CHROMIUM_ARGS,
         )
 
-        page = context.new_page()
-        print(f"Opening {url} ...")
-        page.goto(url, wait_until="domcontentloaded")
+        cookies = _collect_cookies(context, url, timeout=timeout)
 
-        # Wait until the OpenSearch Dashboards page is loaded (SSO redirect completes).
-        # The dashboard sets the security cookies once authenticated.
-        print("Waiting for SSO to complete ...")
-        try:
-            page.wait_for_url(f"{url}/**", timeout=timeout * 1000)
-        except Exception:
-            # Even if URL pattern doesn't match exactly, check cookies
-            pass
-
-        # Poll for the required cookies (they appear after OIDC redirect completes)
-        cookies = {}
-        for attempt in range(timeout * 2):  # check every 0.5s
-            all_cookies = context.cookies(url)
-            for c in all_cookies:
-                if c["name"] in REQUIRED_COOKIES:
-                    cookies[c["name"]] = c["value"]
-            if len(cookies) == len(REQUIRED_COOKIES):
-                break
-            page.wait_for_timeout(500)
-        else:
+        if len(cookies) != len(REQUIRED_COOKIES):
             found = list(cookies.keys())
             print(f"Warning: Only found cookies: {found}", file=sys.stderr)
             if not cookies:
@@ -84,43 +201,290 @@ def fetch_cookies(url: str, headless: bool = False, timeout: int = 60) -> str:
     return cookie_str
 
 
+# ── Parallel multi-cluster refresh ───────────────────────────────────────────
+
+async def _block_heavy_resources_async(route):
+    """Async twin of _block_heavy_resources for the async Playwright API."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _fetch_one_async(context, name: str, url: str, timeout: int):
+    """Fetch cookies for one cluster in its own page of a shared context."""
+    page = await context.new_page()
+    await page.route("**/*", _block_heavy_resources_async)
+    print(f"[{name}] Opening {url} ...")
+    # Same synchronisation as _collect_cookies: the OIDC callback's
+    # Set-Cookie response is the tightest signal and the only one that
+    # fires for HttpOnly cookies, which document.cookie never sees. The
+    # listener attaches before goto so a Set-Cookie delivered during the
+    # redirect chain isn't missed.
+    try:
+        async with page.expect_event(
+            "response",
+            predicate=lambda r: "security_authentication" in r.headers.get("set-cookie", ""),
+            timeout=timeout * 1000,
+        ):
+            try:
+                await page.goto(url)
+            except Exception:
+                pass  # navigation timeout expected; SSO continues in the background
+    except Exception:
+        # No fresh Set-Cookie (e.g. session cookies still valid) — give the
+        # in-page predicate a short, capped window before the scan below.
+        try:
+            await page.wait_for_function(
+                COOKIE_JS_PREDICATE, timeout=min(timeout, 10) * 1000, polling=200
+            )
+        except Exception:
+            pass  # HttpOnly cookies — fall through to the context scan
+    cookies = {}
+    for c in await context.cookies(url):
+        if c["name"] in REQUIRED_COOKIES:
+            cookies[c["name"]] = c["value"]
+    await page.close()
+
+    if len(cookies) != len(REQUIRED_COOKIES):
+        print(f"[{name}] Only found cookies: {list(cookies.keys())}", file=sys.stderr)
+        return name, None
+    cookie_str = "; ".join(f"{n}={v}" for n, v in cookies.items())
+    save_cookies_json(cookie_str, url, cluster=name)
+    return name, cookie_str
+
+
+def refresh_clusters(names: list, timeout: int = 60):
+    """Refresh several clusters with one browser launch and parallel pages.
+
+    K sequential runs cost K x (launch + SSO); this costs
+    1 x launch + max(SSO). The last cluster written becomes the active one
+    in cookies.json; per-cluster snapshots are written for all of them.
+    """
+    import asyncio
+    from playwright.async_api import async_playwright
+
+    targets = []
+    for name in names:
+        cluster = CLUSTERS.get(name)
+        if cluster is None or cluster.url is None:
+            print(f"Skipping '{name}': unknown cluster or no OpenSearch", file=sys.stderr)
+            continue
+        targets.append((name, cluster.url.rstrip("/")))
+    if not targets:
+        print("Error: no refreshable clusters given", file=sys.stderr)
+        sys.exit(1)
+
+    async def _run():
+        async with async_playwright() as p:
+            context = await p.chromium.launch_persistent_context(
+                str(BROWSER_DATA_DIR),
+                headless=True,
+                accept_downloads=False,
+                args=CHROMIUM_ARGS,
+            )
+            context.set_default_navigation_timeout(1)
+            try:
+                return await asyncio.gather(
+                    *(_fetch_one_async(context, name, url, timeout) for name, url in targets)
+                )
+            finally:
+                await context.close()
+
+    results = asyncio.run(_run())
+    failed = [name for name, cookie_str in results if cookie_str is None]
+    if failed:
+        print(f"Failed clusters: {', '.join(failed)} (SSO session may have expired)", file=sys.stderr)
+        sys.exit(1)
+    print(f"\nDone! Refreshed {len(results)} cluster(s).")
+
+
+# ── Refresh daemon ────────────────────────────────────────────────────────────
+#
+# Launching Chromium costs hundreds of ms to seconds per invocation. The
+# daemon keeps a single persistent context warm and serves refresh requests
+# over a UNIX socket, so each refresh only pays navigate+SSO.
+
+REFRESH_SOCKET = BROWSER_DATA_DIR / "refresh.sock"
+
+
+def fetch_cookies_via_daemon(url: str, cluster: str, timeout: int = 60) -> tuple[bool, str | None]:
+    """Ask a running refresh daemon for cookies.
+
+    Returns (handled, cookie). handled=False means no daemon answered
+    (missing/stale socket, daemon died mid-request) and the caller is free
+    to launch its own browser. handled=True means a daemon owns the
+    .browser-data profile — even on error the caller must NOT launch a
+    second Chromium on that profile, because Chromium refuses locked
+    profiles.
+    """
+    if not REFRESH_SOCKET.exists():
+        return False, None
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout + 10)
+        sock.connect(str(REFRESH_SOCKET))
+        request = {"url": url, "cluster": cluster, "timeout": timeout}
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        response = json.loads(sock.makefile("r").readline())
+        sock.close()
+    except (OSError, json.JSONDecodeError):
+        return False, None  # stale socket or daemon died mid-request
+    if "error" in response:
+        print(f"Daemon: {response['error']}", file=sys.stderr)
+        return True, None
+    return True, response.get("cookie")
+
+
+def run_daemon(timeout: int = 60):
+    """Keep one warm browser context and serve cookie refreshes over a socket.
+
+    Protocol: one JSON request line ({"url", "cluster", "timeout"}) per
+    connection, one JSON response line ({"cookie"} or {"error"}) back.
+    cookies.json is written from inside the daemon so the MCP server picks
+    up refreshed cookies immediately.
+    """
+    from playwright.sync_api import sync_playwright
+
+    BROWSER_DATA_DIR.mkdir(exist_ok=True)
+    if REFRESH_SOCKET.exists():
+        REFRESH_SOCKET.unlink()
+
+    server_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server_sock.bind(str(REFRESH_SOCKET))
+    server_sock.listen(1)
+    print(f"Refresh daemon listening on {REFRESH_SOCKET}")
+
+    with sync_playwright() as p:
+        context = p.chromium.launch_persistent_context(
+            str(BROWSER_DATA_DIR),
+            headless=True,
+            accept_downloads=False,
+            args=CHROMIUM_ARGS,
+        )
+        try:
+            while True:
+                conn, _ = server_sock.accept()
+                with conn:
+                    # Bound the request read: a client that connects and
+                    # never sends must not wedge the single-threaded daemon.
+                    conn.settimeout(10)
+                    try:
+                        request = json.loads(conn.makefile("r").readline())
+                        url = request["url"].rstrip("/")
+                        cookies = _collect_cookies(
+                            context, url, timeout=request.get("timeout", timeout)
+                        )
+                        if len(cookies) == len(REQUIRED_COOKIES):
+                            cookie_str = "; ".join(f"{n}={v}" for n, v in cookies.items())
+                            save_cookies_json(cookie_str, url, cluster=request.get("cluster", "unknown"))
+                            response = {"cookie": cookie_str}
+                        else:
+                            response = {"error": f"Only found cookies: {list(cookies.keys())}"}
+                    except Exception as e:
+                        response = {"error": f"{type(e).__name__}: {e}"}
+                    try:
+                        conn.sendall(json.dumps(response).encode() + b"\n")
+                    except OSError:
+                        pass  # client went away mid-reply; keep serving
+        except KeyboardInterrupt:
+            print("\nShutting down refresh daemon")
+        finally:
+            context.close()
+            server_sock.close()
+            REFRESH_SOCKET.unlink(missing_ok=True)
+
+
+def _atomic_write(path: Path, payload: bytes):
+    """Write payload atomically: temp file + fsync + os.replace.
+
+    A crash mid-write can never leave truncated JSON behind, so readers
+    (the MCP server reads cookies.json on every request) never see a
+    partial file.
+    """
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    # fsync the directory so the rename itself is durable
+    dir_fd = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
 def save_cookies_json(cookie_str: str, url: str, cluster: str = "unknown"):
-    """Write cookies to cookies.json for the MCP server to read at request time."""
-    cookies_file = Path(__file__).parent / "cookies.json"
+    """Write cookies to cookies.json (active) and a per-cluster snapshot.
+
+    cookies.json is what the MCP server reads at request time; the
+    cookies.<cluster>.json snapshot keeps still-valid cookies around when
+    switching between clusters, so cookie rotation never touches .mcp.json.
+    """
+    targets = [COOKIES_JSON_PATH]
+    if cluster and cluster != "unknown":
+        targets.append(_HERE / f"cookies.{cluster}.json")
+
     data = {
         "cookie": cookie_str,
         "url": url,
         "cluster": cluster,
         "updated_at": datetime.now(timezone.utc).isoformat(),
     }
-    cookies_file.write_text(json.dumps(data, indent=2) + "\n")
-    print(f"Updated {cookies_file}")
-
-
-def update_mcp_json(cookie_str: str, url: str):
-    """Update the .mcp.json file with new cookies and URL."""
+    payload = _dumps_json(data)
+
+    for cookies_file in targets:
+        # No-op refresh (same cookie for the same cluster): skip the write so
+        # the MCP server doesn't see a spurious mtime bump.
+        if cookies_file.exists():
+            try:
+                existing = _loads_json(cookies_file.read_bytes())
+            except ValueError:
+                existing = {}
+            if (existing.get("cookie"), existing.get("url"), existing.get("cluster")) == (cookie_str, url, cluster):
+                print(f"{cookies_file} already up to date")
+                continue
+        _atomic_write(cookies_file, payload)
+        print(f"Updated {cookies_file}")
+
+
+def update_mcp_json(url: str):
+    """Bootstrap/refresh the .mcp.json server entry (URL only, never cookies).
+
+    Cookies live exclusively in cookies.json so rotating them doesn't force
+    clients that watch .mcp.json to reload unrelated config.
+    """
+    original = None
     if MCP_JSON_PATH.exists():
-        with open(MCP_JSON_PATH) as f:
-            config = json.load(f)
+        config = _loads_json(MCP_JSON_PATH.read_bytes())
+        original = json.dumps(config, indent=2, sort_keys=True)
     else:
         config = {"mcpServers": {}}
 
     if "opensearch" not in config.get("mcpServers", {}):
         config["mcpServers"]["opensearch"] = {
             "type": "stdio",
-            "command": str(Path(__file__).parent / "venv" / "bin" / "python"),
-            "args": [str(Path(__file__).parent / "server.py")],
+            "command": VENV_PYTHON,
+            "args": [SERVER_PY],
             "env": {},
         }
 
     env = config["mcpServers"]["opensearch"]["env"]
     env["OPENSEARCH_URL"] = url
-    env["OPENSEARCH_COOKIE"] = cookie_str
+    env.pop("OPENSEARCH_COOKIE", None)  # cookies moved to cookies.json
     env.setdefault("OPENSEARCH_VERIFY_SSL", "true")
 
-    with open(MCP_JSON_PATH, "w") as f:
-        json.dump(config, f, indent=2)
-        f.write("\n")
+    # Skip the write entirely when nothing changed (same cluster within a
+    # cookie's lifetime) — no disk write, no fsync, no watcher reload.
+    if original is not None and json.dumps(config, indent=2, sort_keys=True) == original:
+        print(f"{MCP_JSON_PATH} already up to date")
+        return
+
+    # Serialise once and emit a single write() syscall instead of the many
+    # tiny writes json.dump issues through a buffered text stream.
+    _atomic_write(MCP_JSON_PATH, _dumps_json(config))
 
     print(f"Updated {MCP_JSON_PATH}")
 
@@ -133,22 +497,29 @@ def main():
     parser.add_argument("--url", help="Use a custom URL instead of a registered cluster")
     parser.add_argument("--headless", action="store_true", help="Run browser in headless mode (only works if SSO session is cached)")
     parser.add_argument("--timeout", type=int, default=60, help="Timeout in seconds waiting for SSO (default: 60)")
+    parser.add_argument("--daemon", action="store_true", help="Run as a refresh daemon keeping a warm browser (serves requests over a UNIX socket)")
+    parser.add_argument("--clusters", help="Comma-separated cluster names to refresh in parallel with one browser (headless; needs cached SSO)")
     args = parser.parse_args()
 
+    if args.daemon:
+        run_daemon(timeout=args.timeout)
+        return
+
+    if args.clusters:
+        refresh_clusters([c.strip() for c in args.clusters.split(",") if c.strip()], timeout=args.timeout)
+        return
+
     if args.list:
-        current_env = ""
-        for name, (url, desc) in CLUSTERS.items():
-            env = name.split("-")[0]  # dev, stg, prod
-            if env != current_env:
-                current_env = env
-                label = {"dev": "Development", "stg": "Staging", "prod": "Production"}
-                print(f"\n  {'─' * 60}")
-                print(f"  {label.get(env, env.upper())}")
-                print(f"  {'─' * 60}")
-            status = "✗ NO OPENSEARCH" if url is None else url
-            print(f"  {name:30s} {status}")
-            if url is None:
-                print(f"  {'':30s} ({desc})")
+        label = {"dev": "Development", "stg": "Staging", "prod": "Production"}
+        for env, entries in CLUSTERS_BY_ENV.items():
+            print(f"\n  {'─' * 60}")
+            print(f"  {label.get(env, env.upper())}")
+            print(f"  {'─' * 60}")
+            for name, cluster in entries:
+                status = "✗ NO OPENSEARCH" if cluster.url is None else cluster.url
+                print(f"  {name:30s} {status}")
+                if cluster.url is None:
+                    print(f"  {'':30s} ({cluster.desc})")
         print()
         return
 
@@ -163,27 +534,39 @@ def main():
         cluster_name = args.cluster
         if cluster_name not in CLUSTERS:
             print(f"Error: Unknown cluster '{cluster_name}'", file=sys.stderr)
-            print(f"Available: {', '.join(k for k, (u, _) in CLUSTERS.items() if u)}", file=sys.stderr)
+            print(f"Available: {AVAILABLE_CLUSTERS}", file=sys.stderr)
             print(f"Or use --url to specify a custom URL", file=sys.stderr)
             sys.exit(1)
-        url, desc = CLUSTERS[cluster_name]
+        cluster = CLUSTERS[cluster_name]
+        url = cluster.url
         if url is None:
             print(f"Error: '{cluster_name}' does not have OpenSearch.", file=sys.stderr)
-            print(f"  → {desc}", file=sys.stderr)
+            print(f"  → {cluster.desc}", file=sys.stderr)
             sys.exit(1)
 
     print(f"Cluster: {cluster_name}")
     print(f"URL:     {url}")
 
-    cookie_str = fetch_cookies(url, headless=args.headless, timeout=args.timeout)
+    # Prefer a running refresh daemon (warm browser, no launch cost); only
+    # launch Chromium ourselves when no daemon answered — the daemon holds
+    # the .browser-data profile lock, so a second instance cannot start
+    # while it is up.
+    daemon_handled, cookie_str = fetch_cookies_via_daemon(url, cluster_name, timeout=args.timeout)
+    if daemon_handled and cookie_str is None:
+        print("Error: the refresh daemon could not get cookies (SSO session may have expired).", file=sys.stderr)
+        print("Stop the daemon (it holds the browser profile) and re-run this script", file=sys.stderr)
+        print("to log in with a visible browser.", file=sys.stderr)
+        sys.exit(1)
+    if cookie_str is None:
+        cookie_str = fetch_cookies(url, headless=args.headless, timeout=args.timeout)
 
     if args.print_only:
         print(f"\nCookies:\n{cookie_str}")
     else:
         # Write cookies.json (read by MCP server at request time — no restart needed)
         save_cookies_json(cookie_str, url, cluster=cluster_name)
-        # Also update .mcp.json (used on MCP server startup as fallback)
-        update_mcp_json(cookie_str, url)
+        # Also update .mcp.json (URL only; used on MCP server startup)
+        update_mcp_json(url)
         print(f"\nDone! Cookies refreshed. No Claude Code restart needed.")
 
 
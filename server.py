@@ -14,25 +14,108 @@ Cookie management:
   - If auto-refresh fails, returns error with manual instructions
 """
 
+import asyncio
+import functools
+import heapq
 import json
 import os
 import sys
 import time
+from collections import namedtuple
+from operator import itemgetter
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 import httpx
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
-from clusters import CLUSTERS
+from clusters import ACTIVE_CLUSTERS, CLUSTERS
+from _fields_extract import extract_fields as _extract_fields
+
+# Prebuilt cluster views: the clusters that actually have OpenSearch, and a
+# name -> (normalised_url, desc) map so the switch happy path is one lookup
+# with no per-call rstrip or list allocation.
+_AVAILABLE_CLUSTERS = tuple(k for k, c in CLUSTERS.items() if c.url is not None)
+_CLUSTER_URLS = {k: (c.url.rstrip("/"), c.desc) for k, c in CLUSTERS.items() if c.url}
+
+# orjson accelerates the encode side (request payloads, outbound results).
+# Decoding responses stays on stdlib json: orjson parses ints wider than
+# 64 bits as lossy floats, unacceptable on the long-numerals endpoint.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson lets get_mappings pull just the first hit's _source out of the
+# response stream instead of materialising the whole body; optional like
+# orjson, with the full-parse path as fallback.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# msgspec is a second accelerated JSON tier for environments without orjson
+# (its encoder is likewise C-implemented); stdlib json is the final fallback.
+try:
+    import msgspec.json as _msgspec_json
+except ImportError:
+    _msgspec_json = None
+
+
+def _json_loads(data: bytes):
+    """Parse a search response body.
+
+    Always stdlib json: the -with-long-numerals endpoint exists to carry
+    integers wider than 64 bits, which orjson silently degrades to lossy
+    floats and msgspec rejects outright. Only the stdlib parser preserves
+    them exactly, and mangled IDs are worse than slower parses.
+    """
+    return json.loads(data)
+
+
+def _json_dumps(obj, indent: bool = False) -> str:
+    """Hot-path JSON dump (orjson, then msgspec, then stdlib), returning str.
+
+    The accelerated encoders raise on integers wider than 64 bits, which
+    legitimately appear in hits from the long-numerals endpoint — those
+    payloads drop through to stdlib json, which encodes them exactly.
+    """
+    try:
+        if orjson is not None:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0, default=str).decode()
+        if _msgspec_json is not None:
+            encoded = _msgspec_json.encode(obj, enc_hook=str)
+            if indent:
+                encoded = _msgspec_json.format(encoded, indent=2)
+            return encoded.decode()
+    except (TypeError, OverflowError):
+        pass
+    return json.dumps(obj, indent=2 if indent else None, default=str)
+
+
+def _encode_payload(payload: dict) -> bytes:
+    """Encode a request payload, tolerating >64-bit integers.
+
+    orjson raises TypeError on them, and caller-supplied bodies (e.g.
+    search_raw term filters on long-numeral fields) may carry them —
+    stdlib json encodes them exactly.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload)
+        except TypeError:
+            pass
+    return json.dumps(payload).encode()
+
 
 # Configuration from environment (used as fallbacks)
 OPENSEARCH_URL_ENV = os.environ.get("OPENSEARCH_URL", "").rstrip("/")
 OPENSEARCH_COOKIE = os.environ.get("OPENSEARCH_COOKIE", "")
 OPENSEARCH_VERIFY_SSL = os.environ.get("OPENSEARCH_VERIFY_SSL", "true").lower() == "true"
 OSD_VERSION = os.environ.get("OSD_VERSION", "2.18.0")
+MAPPINGS_CACHE_TTL = float(os.environ.get("OPENSEARCH_MAPPINGS_CACHE_TTL", "60"))
 
 # Paths
 SERVER_DIR = Path(__file__).parent
@@ -41,13 +124,20 @@ BROWSER_DATA_DIR = SERVER_DIR / ".browser-data"
 LOG_FILE = SERVER_DIR / "server.log"
 
 
+# Opened lazily on first log() call and kept line-buffered for the server's
+# lifetime — one open() syscall total instead of one per log line.
+_log_fh = None
+
+
 def log(msg: str):
     """Write a timestamped log line to both stderr and server.log for debugging."""
+    global _log_fh
     ts = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
     line = f"[{ts}] {msg}"
     print(line, file=sys.stderr)
-    with open(LOG_FILE, "a") as f:
-        f.write(line + "\n")
+    if _log_fh is None:
+        _log_fh = open(LOG_FILE, "a", buffering=1)
+    _log_fh.write(line + "\n")
 
 # Cookie names required for OpenSearch Dashboards OIDC auth
 REQUIRED_COOKIES = ["security_authentication", "security_authentication_oidc1"]
@@ -57,14 +147,32 @@ server = Server("opensearch-cookie-auth")
 
 # ── Cookie & URL Management ───────────────────────────────────────────────────
 
+# Parsed cookies.json cache, invalidated by file mtime. Several helpers read
+# the file on every tool call; with the cache the common case is one stat().
+_cookies_cache: dict | None = None
+_cookies_mtime: float = 0.0
+
+
 def _read_cookies_json() -> dict | None:
-    """Read and parse cookies.json, returning None on any error."""
-    if COOKIES_FILE.exists():
-        try:
-            return json.loads(COOKIES_FILE.read_text())
-        except (json.JSONDecodeError, KeyError):
-            pass
-    return None
+    """Read and parse cookies.json, returning None on any error.
+
+    The parsed dict is cached and only re-read when the file's mtime
+    changes (e.g. after get-cookies.py or an auto-refresh rewrites it).
+    """
+    global _cookies_cache, _cookies_mtime
+    try:
+        mtime = COOKIES_FILE.stat().st_mtime
+    except OSError:
+        return None
+    if mtime == _cookies_mtime and _cookies_cache is not None:
+        return _cookies_cache
+    try:
+        _cookies_cache = json.loads(COOKIES_FILE.read_text())
+        _cookies_mtime = mtime
+    except (json.JSONDecodeError, KeyError, OSError):
+        _cookies_cache = None
+        _cookies_mtime = 0.0
+    return _cookies_cache
 
 
 def get_active_url() -> str:
@@ -96,18 +204,26 @@ def get_active_cluster() -> dict:
     }
 
 
-def load_cookies() -> str:
-    """Load cookies from cookies.json, falling back to env var.
+# Consistent snapshot of the active session, resolved once per tool call so
+# a request never mixes fields from before and after an interleaved refresh.
+_ActiveSession = namedtuple("_ActiveSession", "url cookie cluster updated_at")
+
 
-    cookies.json is read on every request so that refreshed cookies
-    are picked up without restarting the MCP server.
+def resolve_active_session() -> _ActiveSession:
+    """Read cookies.json once and return url, cookie, cluster and updated_at.
+
+    Replaces separate get_active_url/get_active_cluster reads on the
+    request path, which each re-ran the stat + parse-cache check.
     """
     data = _read_cookies_json()
     if data:
-        cookie_str = data.get("cookie", "")
-        if cookie_str:
-            return cookie_str
-    return OPENSEARCH_COOKIE
+        return _ActiveSession(
+            (data.get("url") or OPENSEARCH_URL_ENV).rstrip("/"),
+            data.get("cookie") or OPENSEARCH_COOKIE,
+            data.get("cluster", "unknown"),
+            data.get("updated_at", ""),
+        )
+    return _ActiveSession(OPENSEARCH_URL_ENV, OPENSEARCH_COOKIE, "unknown", "")
 
 
 def save_cookies(cookie_str: str, url: str = None, cluster: str = None):
@@ -120,71 +236,143 @@ def save_cookies(cookie_str: str, url: str = None, cluster: str = None):
         "cluster": cluster or existing.get("cluster", "unknown"),
         "updated_at": datetime.now(timezone.utc).isoformat(),
     }
-    COOKIES_FILE.write_text(json.dumps(data, indent=2) + "\n")
+    # Atomic write (tmp + rename): readers can never observe a partial file,
+    # which keeps the mtime cache in _read_cookies_json sound.
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    else:
+        payload = json.dumps(data, indent=2).encode() + b"\n"
+    tmp = COOKIES_FILE.with_suffix(".json.tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, COOKIES_FILE)
+    # Invalidate the parse cache so the next read picks up the new file
+    global _cookies_mtime
+    _cookies_mtime = 0.0
     log(f"[cookie-refresh] Saved fresh cookies to {COOKIES_FILE}")
 
 
+# Playwright state for the refresh in flight. The context lives only for
+# the duration of one refresh attempt: Chromium allows a single live context
+# per persistent profile, so keeping it warm between refreshes would hold the
+# .browser-data lock and block the `./get-cookies.py <cluster>` re-login this
+# server's own error messages point users at.
+_pw = None
+_pw_context = None
+
+
+async def _ensure_browser():
+    """Return the headless persistent context, launching it if needed."""
+    global _pw, _pw_context
+    if _pw_context is not None:
+        return _pw_context
+    from playwright.async_api import async_playwright
+    _pw = await async_playwright().start()
+    _pw_context = await _pw.chromium.launch_persistent_context(
+        str(BROWSER_DATA_DIR),
+        headless=True,
+        accept_downloads=False,
+    )
+    log("[cookie-refresh] Browser launched successfully")
+    return _pw_context
+
+
+async def close_browser():
+    """Close the browser context, releasing the profile lock."""
+    global _pw, _pw_context
+    if _pw_context is not None:
+        try:
+            await _pw_context.close()
+        except Exception:
+            pass
+        _pw_context = None
+    if _pw is not None:
+        try:
+            await _pw.stop()
+        except Exception:
+            pass
+        _pw = None
+
+
+async def _collect_refresh_cookies(context, url: str) -> str | None:
+    """Drive one page through SSO in the given context; return cookie string."""
+    page = await context.new_page()
+    try:
+        log(f"[cookie-refresh] Navigating to {url}")
+        await page.goto(url, wait_until="domcontentloaded")
+        log(f"[cookie-refresh] Page loaded. Current URL: {page.url}")
+        log(f"[cookie-refresh] Page title: {await page.title()}")
+
+        # Event-driven wait: the post-SSO redirect lands back in the
+        # Dashboards app. Waiting on that URL replaces up to 60 cookie polls
+        # (each an IPC round-trip to the browser) with one wait and, in the
+        # common case, a single cookies() call.
+        try:
+            await page.wait_for_url("**/app/**", timeout=30000)
+            log(f"[cookie-refresh] Post-SSO redirect complete: {page.url}")
+        except Exception:
+            log(f"[cookie-refresh] No /app/ redirect observed — checking cookies anyway (URL: {page.url})")
+
+        # Short fallback poll in case the cookies land just after the redirect
+        cookies = {}
+        for attempt in range(3):
+            for c in await context.cookies(url):
+                if c["name"] in REQUIRED_COOKIES:
+                    cookies[c["name"]] = c["value"]
+            if len(cookies) == len(REQUIRED_COOKIES):
+                break
+            await page.wait_for_timeout(200)
+
+        if len(cookies) == len(REQUIRED_COOKIES):
+            cookie_str = "; ".join(f"{name}={value}" for name, value in cookies.items())
+            log("[cookie-refresh] Refresh successful!")
+            return cookie_str
+        else:
+            found = list(cookies.keys())
+            log(f"[cookie-refresh] Refresh FAILED — only got: {found}")
+            log(f"[cookie-refresh] Final page URL was: {page.url}")
+            return None
+    finally:
+        await page.close()
+
+
 async def _refresh_cookies_for_url(url: str, headless: bool = True) -> str | None:
     """Attempt to refresh cookies for a specific URL using async Playwright.
 
-    Returns the new cookie string on success, None on failure.
-    Must be called from within an asyncio event loop.
+    Each refresh launches its own context and closes it before returning,
+    so the .browser-data profile is only locked while a refresh is actually
+    running. Returns the new cookie string on success, None on failure.
+    Must be called from within an asyncio loop.
     """
-    try:
-        from playwright.async_api import async_playwright
-    except ImportError:
-        log("[cookie-refresh] Playwright not installed, cannot auto-refresh")
-        return None
-
     log(f"[cookie-refresh] Attempting {'headless' if headless else 'headed'} refresh for {url}")
     log(f"[cookie-refresh] Browser data dir: {BROWSER_DATA_DIR} (exists={BROWSER_DATA_DIR.exists()})")
 
     try:
+        if headless:
+            context = await _ensure_browser()
+            try:
+                return await _collect_refresh_cookies(context, url)
+            finally:
+                await close_browser()
+
+        # Headed refresh: make sure no leftover headless context holds the
+        # profile lock, then launch a visible one-shot browser.
+        from playwright.async_api import async_playwright
+        await close_browser()
         async with async_playwright() as p:
             context = await p.chromium.launch_persistent_context(
                 str(BROWSER_DATA_DIR),
-                headless=headless,
+                headless=False,
                 accept_downloads=False,
             )
             log("[cookie-refresh] Browser launched successfully")
+            try:
+                return await _collect_refresh_cookies(context, url)
+            finally:
+                await context.close()
 
-            page = await context.new_page()
-            log(f"[cookie-refresh] Navigating to {url}")
-            await page.goto(url, wait_until="domcontentloaded")
-            log(f"[cookie-refresh] Page loaded. Current URL: {page.url}")
-            log(f"[cookie-refresh] Page title: {await page.title()}")
-
-            # Wait for SSO redirect to complete and cookies to appear
-            cookies = {}
-            final_url = page.url
-            for i in range(60):  # poll for up to 30 seconds
-                all_cookies = await context.cookies(url)
-                for c in all_cookies:
-                    if c["name"] in REQUIRED_COOKIES:
-                        cookies[c["name"]] = c["value"]
-                if len(cookies) == len(REQUIRED_COOKIES):
-                    log(f"[cookie-refresh] Got both cookies after {i * 0.5}s")
-                    break
-                if i % 10 == 0:  # log every 5 seconds
-                    all_names = [c["name"] for c in all_cookies]
-                    final_url = page.url
-                    log(f"[cookie-refresh] Poll {i}/60 — current URL: {final_url}")
-                    log(f"[cookie-refresh] Poll {i}/60 — all cookie names: {all_names}")
-                    log(f"[cookie-refresh] Poll {i}/60 — matched so far: {list(cookies.keys())}")
-                await page.wait_for_timeout(500)
-
-            await context.close()
-
-            if len(cookies) == len(REQUIRED_COOKIES):
-                cookie_str = "; ".join(f"{name}={value}" for name, value in cookies.items())
-                log("[cookie-refresh] Refresh successful!")
-                return cookie_str
-            else:
-                found = list(cookies.keys())
-                log(f"[cookie-refresh] Refresh FAILED — only got: {found}")
-                log(f"[cookie-refresh] Final page URL was: {final_url}")
-                return None
-
+    except ImportError:
+        log("[cookie-refresh] Playwright not installed, cannot auto-refresh")
+        return None
     except Exception as e:
         log(f"[cookie-refresh] Refresh error: {type(e).__name__}: {e}")
         return None
@@ -204,50 +392,198 @@ async def auto_refresh_cookies() -> str | None:
 
 # ── HTTP Client ───────────────────────────────────────────────────────────────
 
-def get_client(cookie_str: str = None) -> httpx.Client:
-    """Create an HTTP client with cookie authentication matching browser headers."""
+# One pooled client for the whole server lifetime: repeat tool calls reuse
+# the TCP+TLS connection instead of paying a fresh handshake per request.
+_shared_client: httpx.AsyncClient | None = None
+_client_state: tuple | None = None  # (base_url, cookie) the client is configured for
+
+
+def get_client(cookie_str: str = None, session: _ActiveSession = None) -> httpx.AsyncClient:
+    """Return the shared pooled HTTP client configured for the active cluster.
+
+    Created lazily on first use. When the active URL or cookie changes
+    (cluster switch, cookie refresh) the headers and base_url are updated in
+    place so the connection pool survives across requests. Callers that
+    already resolved a session snapshot pass it in to avoid a re-read.
+    """
+    global _shared_client, _client_state
+
+    if session is None:
+        session = resolve_active_session()
     if cookie_str is None:
-        cookie_str = load_cookies()
+        cookie_str = session.cookie
+    url = session.url
+
+    if _shared_client is None:
+        client_kwargs = dict(
+            verify=OPENSEARCH_VERIFY_SSL,
+            timeout=120.0,
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=40,
+                keepalive_expiry=60,
+            ),
+        )
+        try:
+            # HTTP/2 lets concurrent tool calls multiplex one connection;
+            # httpx raises ImportError here when the optional h2 package
+            # is missing, in which case HTTP/1.1 keep-alive still applies.
+            _shared_client = httpx.AsyncClient(http2=True, **client_kwargs)
+        except ImportError:
+            _shared_client = httpx.AsyncClient(**client_kwargs)
+
+    if _client_state != (url, cookie_str):
+        headers = {
+            "Accept": "*/*",
+            "Content-Type": "application/json",
+            "osd-xsrf": "osd-fetch",
+            "osd-version": OSD_VERSION,
+            "Origin": url,
+            "Referer": f"{url}/app/data-explorer/discover",
+        }
+        if cookie_str:
+            headers["Cookie"] = cookie_str
+        _shared_client.headers = headers
+        _shared_client.base_url = url
+        _client_state = (url, cookie_str)
 
-    url = get_active_url()
-    headers = {
-        "Accept": "*/*",
-        "Content-Type": "application/json",
-        "osd-xsrf": "osd-fetch",
-        "osd-version": OSD_VERSION,
-        "Origin": url,
-        "Referer": f"{url}/app/data-explorer/discover",
-    }
-    if cookie_str:
-        headers["Cookie"] = cookie_str
+    return _shared_client
 
-    return httpx.Client(
-        base_url=url,
-        headers=headers,
-        verify=OPENSEARCH_VERIFY_SSL,
-        timeout=120.0,
-    )
+
+async def close_client():
+    """Close the shared HTTP client (called on server shutdown)."""
+    global _shared_client, _client_state
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
+        _client_state = None
 
 
-def make_search_request(client: httpx.Client, index: str, body: dict) -> dict:
+async def make_search_request(client: httpx.AsyncClient, index: str, body: dict) -> dict:
     """Make a search request using the internal search endpoint (same as browser)."""
     payload = {
         "params": {
             "index": index,
             "body": body,
-            "preference": int(time.time() * 1000),
+            "preference": time.time_ns() // 1_000_000,
         }
     }
-    response = client.post("/internal/search/opensearch-with-long-numerals", json=payload)
+    # Encode the body ourselves — the client headers already carry
+    # Content-Type: application/json.
+    response = await client.post(
+        "/internal/search/opensearch-with-long-numerals",
+        content=_encode_payload(payload),
+    )
     response.raise_for_status()
-    result = response.json()
+    result = _json_loads(response.content)
     return result.get("rawResponse", result)
 
 
+async def _stream_first_hit_source(client: httpx.AsyncClient, index: str, body: dict) -> dict | None:
+    """Stream a search response and return only the first hit's _source.
+
+    Used by get_mappings, which needs a single sampled document: the rest
+    of the (potentially MB-scale) body is parsed incrementally and never
+    materialised. Requires ijson; callers fall back to make_search_request
+    when it is unavailable. Raises ijson.common.JSONError when the stream
+    carries values ijson can't parse — notably the >64-bit integers this
+    endpoint exists for, which overflow its yajl backends — and callers
+    must fall back to the full parse then too.
+    """
+    payload = {
+        "params": {
+            "index": index,
+            "body": body,
+            "preference": time.time_ns() // 1_000_000,
+        }
+    }
+    content = _encode_payload(payload)
+
+    async with client.stream(
+        "POST", "/internal/search/opensearch-with-long-numerals", content=content
+    ) as response:
+        if response.status_code >= 400:
+            # Read the body so error handlers can access response.content
+            await response.aread()
+            response.raise_for_status()
+
+        # The endpoint wraps the search response in "rawResponse", but
+        # make_search_request tolerates its absence — match both prefixes.
+        # use_float keeps non-integer numbers as float (ijson defaults to
+        # Decimal, which would misreport float fields to extract_fields).
+        hits = ijson.sendable_list()
+        coros = [
+            ijson.items_coro(hits, "rawResponse.hits.hits.item._source", use_float=True),
+            ijson.items_coro(hits, "hits.hits.item._source", use_float=True),
+        ]
+        async for chunk in response.aiter_bytes():
+            for coro in coros:
+                try:
+                    coro.send(chunk)
+                except StopIteration:
+                    pass
+            if hits:
+                break
+        return hits[0] if hits else None
+
+
+# Static sub-structures of the Dashboards query body, built once at import.
+# They are never mutated downstream (the body is only serialised), so sharing
+# them across requests is safe and skips ~8 dict/list allocations per query.
+_QUERY_STATIC = {
+    "version": True,
+    "stored_fields": ["*"],
+    "script_fields": {},
+    "docvalue_fields": [{"field": "@timestamp", "format": "date_time"}],
+    "_source": {"excludes": []},
+    "highlight": {
+        "pre_tags": ["@opensearch-dashboards-highlighted-field@"],
+        "post_tags": ["@/opensearch-dashboards-highlighted-field@"],
+        "fields": {"*": {}},
+        "fragment_size": 2147483647,
+    },
+}
+
+
+# Shared sub-structures for the default search shape (no query string,
+# newest-first on @timestamp). Like _QUERY_STATIC they are never mutated —
+# the body is only serialised — so reusing them across calls is safe.
+_MATCH_ALL = [{"match_all": {}}]
+_SORT_TIMESTAMP_DESC = [{"@timestamp": {"order": "desc", "unmapped_type": "boolean"}}]
+
+
+@functools.lru_cache(maxsize=512)
 def build_dashboard_query(query_str: str, time_from: str = None, time_to: str = None,
                           size: int = 100, sort_field: str = "@timestamp",
                           sort_order: str = "desc") -> dict:
-    """Build a query body matching the exact format used by OpenSearch Dashboards UI."""
+    """Build a query body matching the exact format used by OpenSearch Dashboards UI.
+
+    Memoized: repeated identical calls (same query and time range) reuse the
+    built dict. Like _QUERY_STATIC, the returned body is shared and must only
+    be serialised, never mutated by callers.
+    """
+    # Fast path: most searches pass only an index and a time range, so the
+    # query collapses to match_all + one range filter with the default sort.
+    if not query_str and sort_field == "@timestamp" and sort_order == "desc":
+        range_filter = {"format": "strict_date_optional_time"}
+        if time_from:
+            range_filter["gte"] = time_from
+        if time_to:
+            range_filter["lte"] = time_to
+        return {
+            "sort": _SORT_TIMESTAMP_DESC,
+            "size": size,
+            **_QUERY_STATIC,
+            "query": {
+                "bool": {
+                    "must": _MATCH_ALL,
+                    "filter": [{"range": {"@timestamp": range_filter}}] if (time_from or time_to) else [],
+                    "should": [],
+                    "must_not": [],
+                }
+            },
+        }
+
     must = []
     if query_str:
         must.append({
@@ -271,11 +607,7 @@ def build_dashboard_query(query_str: str, time_from: str = None, time_to: str =
     body = {
         "sort": [{sort_field: {"order": sort_order, "unmapped_type": "boolean"}}],
         "size": size,
-        "version": True,
-        "stored_fields": ["*"],
-        "script_fields": {},
-        "docvalue_fields": [{"field": "@timestamp", "format": "date_time"}],
-        "_source": {"excludes": []},
+        **_QUERY_STATIC,
         "query": {
             "bool": {
                 "must": must if must else [{"match_all": {}}],
@@ -284,12 +616,6 @@ def build_dashboard_query(query_str: str, time_from: str = None, time_to: str =
                 "must_not": []
             }
         },
-        "highlight": {
-            "pre_tags": ["@opensearch-dashboards-highlighted-field@"],
-            "post_tags": ["@/opensearch-dashboards-highlighted-field@"],
-            "fields": {"*": {}},
-            "fragment_size": 2147483647
-        }
     }
     return body
 
@@ -387,6 +713,10 @@ async def list_tools() -> list[Tool]:
                         "type": "string",
                         "description": "Index pattern to filter (e.g., 'logs-*'). Leave empty for all indices.",
                     },
+                    "top": {
+                        "type": "number",
+                        "description": "Return only the N busiest indices by doc count (default: 50)",
+                    },
                 },
             },
         ),
@@ -442,6 +772,18 @@ async def list_tools() -> list[Tool]:
                 "properties": {},
             },
         ),
+        Tool(
+            name="opensearch_cluster_health_all",
+            description=(
+                "Check health of every cluster with OpenSearch in parallel. "
+                "Uses per-cluster saved cookies (cookies.<cluster>.json from get-cookies.py); "
+                "clusters without saved cookies are reported as errors, not failures."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {},
+            },
+        ),
         Tool(
             name="opensearch_switch_cluster",
             description=(
@@ -501,22 +843,22 @@ async def _handle_switch_cluster(arguments: dict[str, Any]) -> dict:
     cluster_name = arguments["cluster"]
     headless = arguments.get("headless", True)
 
-    # Validate cluster name
-    if cluster_name not in CLUSTERS:
-        available = [k for k, (u, _) in CLUSTERS.items() if u is not None]
-        return {
-            "error": f"Unknown cluster: '{cluster_name}'",
-            "available_clusters": available,
-        }
-
-    url, desc = CLUSTERS[cluster_name]
-    if url is None:
+    # Validate cluster name — single lookup, the common hit case falls
+    # straight through to the unpack below.
+    entry = _CLUSTER_URLS.get(cluster_name)
+    if entry is None:
+        cluster = CLUSTERS.get(cluster_name)
+        if cluster is None:
+            return {
+                "error": f"Unknown cluster: '{cluster_name}'",
+                "available_clusters": list(_AVAILABLE_CLUSTERS),
+            }
         return {
             "error": f"'{cluster_name}' does not have OpenSearch",
-            "description": desc,
+            "description": cluster.desc,
         }
 
-    url = url.rstrip("/")
+    url, desc = entry
 
     # Attempt to get cookies via Playwright SSO
     cookie_str = await _refresh_cookies_for_url(url, headless=headless)
@@ -546,41 +888,88 @@ async def _handle_switch_cluster(arguments: dict[str, Any]) -> dict:
     }
 
 
+# Soft cap on the serialised tool response, to keep Claude's context lean
+RESPONSE_CHAR_LIMIT = 15000
+
+
+def _serialize_bounded(result: Any, limit: int = RESPONSE_CHAR_LIMIT) -> str:
+    """Serialise a tool result, dropping hits to fit instead of encoding it all.
+
+    Results carrying a "hits" list have tail hits dropped until the encoding
+    fits the limit — we only ever encode the bytes we keep, instead of
+    serialising a multi-MB result and slicing 15KB off the front. Results
+    without a hits list keep the old slice-with-warning-header behaviour.
+    """
+    _meta = result.get("_meta", {}) if isinstance(result, dict) else {}
+    applied = _meta.get("applied_operations", [])
+
+    hits = result.get("hits") if isinstance(result, dict) else None
+    if isinstance(hits, list) and hits:
+        # Budget: limit minus the wrapper (everything except the hits list)
+        wrapper = {k: v for k, v in result.items() if k != "hits"}
+        used = len(_json_dumps(wrapper, indent=True))
+        kept = []
+        for hit in hits:
+            hit_str = _json_dumps(hit, indent=True)
+            # account for the deeper indentation inside the hits array
+            hit_len = len(hit_str) + hit_str.count("\n") * 4 + 8
+            if used + hit_len > limit:
+                break
+            used += hit_len
+            kept.append(hit)
+
+        if len(kept) == len(hits):
+            return _json_dumps(result, indent=True)
+
+        applied.append(f"response_truncated:kept_{len(kept)}_of_{len(hits)}_hits")
+        wrapper["_meta"] = {
+            **_meta,
+            "warning": "Response was truncated by MCP server. Use summary_only, fields filter, or reduce size to get complete results.",
+            "applied_operations": applied,
+        }
+        if "returned" in wrapper:
+            wrapper["returned"] = len(kept)
+        wrapper["hits"] = kept
+        return _json_dumps(wrapper, indent=True)
+
+    result_str = _json_dumps(result, indent=True)
+    if len(result_str) <= limit:
+        return result_str
+
+    applied.append("response_truncated_at_15KB")
+    meta_header = _json_dumps({
+        "_meta": {
+            "warning": "Response was truncated by MCP server. Use summary_only, fields filter, or reduce size to get complete results.",
+            "applied_operations": applied,
+            "original_size_bytes": len(result_str),
+            "truncated_to_bytes": limit,
+        }
+    }, indent=True)
+    return meta_header + "\n" + result_str[:limit - len(meta_header)]
+
+
 @server.call_tool()
 async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
     """Execute an OpenSearch tool with automatic cookie refresh on 401."""
     # Handle tools that don't need an HTTP client
     if name == "opensearch_get_active_cluster":
         result = get_active_cluster()
-        return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
+        return [TextContent(type="text", text=_json_dumps(result, indent=True))]
 
     if name == "opensearch_switch_cluster":
         result = await _handle_switch_cluster(arguments)
-        return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
+        return [TextContent(type="text", text=_json_dumps(result, indent=True))]
 
     try:
         result = await _call_tool_with_retry(name, arguments)
-        result_str = json.dumps(result, indent=2, default=str)
-
-        # Track what the MCP server did to the response
-        _meta = result.get("_meta", {}) if isinstance(result, dict) else {}
-        applied = _meta.get("applied_operations", [])
-
-        if len(result_str) > 15000:
-            applied.append("response_truncated_at_15KB")
-            meta_header = json.dumps({
-                "_meta": {
-                    "warning": "Response was truncated by MCP server. Use summary_only, fields filter, or reduce size to get complete results.",
-                    "applied_operations": applied,
-                    "original_size_bytes": len(result_str),
-                    "truncated_to_bytes": 15000,
-                }
-            }, indent=2)
-            result_str = meta_header + "\n" + result_str[:15000 - len(meta_header)]
-
-        return [TextContent(type="text", text=result_str)]
+        return [TextContent(type="text", text=_serialize_bounded(result))]
     except httpx.HTTPStatusError as e:
-        error_body = e.response.text[:2000] if e.response else "No response body"
+        # Decode only the slice we show — .text would decode the whole body
+        # (potentially MBs) just to throw away everything past 2KB.
+        error_body = (
+            e.response.content[:2000].decode("utf-8", errors="replace")
+            if e.response else "No response body"
+        )
         return [TextContent(
             type="text",
             text=f"HTTP Error {e.response.status_code}: {error_body}"
@@ -591,11 +980,12 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
 
 async def _call_tool_with_retry(name: str, arguments: dict[str, Any]) -> Any:
     """Execute a tool, auto-refreshing cookies on 401 and retrying once."""
-    # First attempt with current cookies
+    # First attempt with current cookies — one session snapshot for the
+    # whole request, shared by the client and the error path below.
+    session = resolve_active_session()
     failed_request = None
     try:
-        with get_client() as client:
-            return await execute_tool(client, name, arguments)
+        return await execute_tool(get_client(session=session), name, arguments)
     except httpx.HTTPStatusError as e:
         if e.response.status_code != 401:
             raise
@@ -607,8 +997,7 @@ async def _call_tool_with_retry(name: str, arguments: dict[str, Any]) -> Any:
 
     if new_cookies is None:
         # Auto-refresh failed — return helpful error
-        cluster_info = get_active_cluster()
-        cluster_name = cluster_info.get("cluster", "unknown")
+        cluster_name = session.cluster
         raise httpx.HTTPStatusError(
             message="Cookie refresh failed",
             request=failed_request,
@@ -625,225 +1014,452 @@ async def _call_tool_with_retry(name: str, arguments: dict[str, Any]) -> Any:
 
     # Retry with fresh cookies
     log("[cookie-refresh] Retrying with fresh cookies...")
-    with get_client(cookie_str=new_cookies) as client:
-        return await execute_tool(client, name, arguments)
+    return await execute_tool(get_client(cookie_str=new_cookies), name, arguments)
 
 
 # ── Tool Implementation ───────────────────────────────────────────────────────
 
-async def execute_tool(client: httpx.Client, name: str, arguments: dict[str, Any]) -> Any:
-    """Execute the specified tool and return results."""
+# TTL memo for get_mappings, keyed by (cluster base_url, index). Bounded so a
+# long-lived server introspecting many indices can't grow it unchecked.
+_MAPPINGS_CACHE: dict[tuple[str, str], tuple[float, dict]] = {}
+_MAPPINGS_CACHE_MAX = 256
+
+def _dig(d, *keys, default=None):
+    """Walk nested dicts by key, returning default on any miss.
+
+    Replaces .get("x", {}).get("y", {}) chains, which allocate a fresh {}
+    default per level even when every key is present.
+    """
+    for k in keys:
+        d = d.get(k) if isinstance(d, dict) else None
+        if d is None:
+            return default
+    return d
+
+
+# Pre-bound extractor for terms-aggregation buckets
+_bucket_kv = itemgetter("key", "doc_count")
+
+# cluster_health sends the same tiny body on every call, so the whole request
+# payload is serialised once at import and only the two timestamps and the
+# preference are %-formatted in — no per-call dict tree, no JSON encoder.
+_HEALTH_PAYLOAD_TMPL = (
+    '{"params":{"index":"*","body":{"size":0,"query":{"bool":{"filter":[{"range":'
+    '{"@timestamp":{"gte":"%s","lte":"%s","format":"strict_date_optional_time"}}}]}}},'
+    '"preference":%d}}'
+)
+
+
+# Second-granularity clock cache: back-to-back tool calls within the same
+# second reuse the datetime instance instead of re-acquiring CLOCK_REALTIME
+# and rebuilding a tz-aware datetime each time.
+_last_now: tuple[int, datetime] = (0, datetime.fromtimestamp(0, timezone.utc))
+
+
+def _now_utc() -> datetime:
+    """UTC now, truncated to the second and cached for that second."""
+    global _last_now
+    t = int(time.time())
+    if t != _last_now[0]:
+        _last_now = (t, datetime.fromtimestamp(t, timezone.utc))
+    return _last_now[1]
+
+
+@functools.lru_cache(maxsize=32)
+def _iso_z(dt: datetime) -> str:
+    """Format a datetime as the second-granularity ISO-8601 Z string the
+    Dashboards API expects. Direct f-string formatting skips strftime's
+    locale-aware machinery (~5x faster)."""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}.000Z"
+
+
+def _default_time_range(minutes: int = 15) -> tuple[str, str]:
+    """Compute default (time_from, time_to) strings for the last N minutes.
 
-    if name == "opensearch_search":
-        index = arguments["index"]
-        query_str = arguments.get("query_string", "")
-        size = min(arguments.get("size", 100), 1000)
-        summary_only = arguments.get("summary_only", False)
-        auto_prune = arguments.get("auto_prune", True)
-        fields = arguments.get("fields")
-        max_chars_per_hit = arguments.get("max_chars_per_hit", 2000)
-
-        # Default time range: last 15 minutes
-        now = datetime.now(timezone.utc)
-        default_from = (now - timedelta(minutes=15)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
-        default_to = now.strftime("%Y-%m-%dT%H:%M:%S.000Z")
-
-        time_from = arguments.get("time_from", default_from)
-        time_to = arguments.get("time_to", default_to)
-
-        # For summary_only, we only need count
-        if summary_only:
-            size = 0
-
-        body = build_dashboard_query(
-            query_str=query_str,
-            time_from=time_from,
-            time_to=time_to,
-            size=size,
+    Called only when the caller didn't supply a time range — isoformat is
+    ~3x faster than strftime, and the common explicit-range case now skips
+    the datetime work entirely.
+    """
+    now = datetime.now(timezone.utc)
+    time_to = now.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    time_from = (now - timedelta(minutes=minutes)).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    return time_from, time_to
+
+
+def _estimate_json_size(obj) -> int:
+    """Cheap lower-bound estimate of an object's JSON-encoded size in chars.
+
+    Walks the structure summing string lengths plus small constants for
+    scalars, without building any intermediate strings. Used to skip the
+    real serialisation for hits that are clearly under the truncation limit.
+
+    Strings must account for escape expansion: log lines are full of
+    quotes, backslashes and newlines, each of which encodes as two chars,
+    so a raw len() would undercount badly enough to slip oversized hits
+    past the gate in _project_hit.
+    """
+    if isinstance(obj, str):
+        return (
+            len(obj) + 2
+            + obj.count('"') + obj.count("\\")
+            + obj.count("\n") + obj.count("\t") + obj.count("\r")
         )
-        result = make_search_request(client, index, body)
+    if isinstance(obj, dict):
+        return 2 + sum(len(k) + 4 + _estimate_json_size(v) for k, v in obj.items())
+    if isinstance(obj, list):
+        return 2 + len(obj) + sum(_estimate_json_size(v) for v in obj)
+    if obj is None:
+        return 4
+    return 8  # numbers / bools
+
+
+def _project_hit(hit: dict, split_fields, auto_prune: bool, max_chars_per_hit: int) -> tuple[dict, bool]:
+    """Project one raw hit into a response entry in a single pass.
+
+    split_fields is the precomputed [(field, parts), ...] list when field
+    filtering is active, else None — the dotted paths are split once per
+    request instead of once per hit. Returns (entry, truncated).
+    """
+    source = hit.get("_source", {})
+
+    if split_fields:
+        entry = {}
+        for field, parts in split_fields:
+            # Support nested fields like "kubernetes.namespace_name"
+            value = source
+            for part in parts:
+                if isinstance(value, dict):
+                    value = value.get(part)
+                else:
+                    value = None
+                    break
+            if value is not None:
+                entry[field] = value
+    else:
+        # No field filter: augment the parsed _source in place instead of
+        # copying it into a fresh dict. The parsed response is ours and the
+        # entry only lives to be serialised, so the per-hit copy was pure
+        # allocator churn (1000+ dicts on a size=1000 search).
+        entry = source if isinstance(source, dict) else {"_source": source}
+        entry["_index"] = hit.get("_index")
+
+        # Auto-prune: remove verbose kubernetes fields
+        if auto_prune and "kubernetes" in entry:
+            k8s = entry["kubernetes"]
+            if isinstance(k8s, dict):
+                k8s.pop("annotations", None)
+                k8s.pop("labels", None)
+
+    # Truncate if exceeds max_chars_per_hit. The cheap estimate filters out
+    # the common under-limit case so only hits near the limit pay for a real
+    # serialisation.
+    if _estimate_json_size(entry) > 0.7 * max_chars_per_hit:
+        entry_str = _json_dumps(entry)
+        if len(entry_str) > max_chars_per_hit:
+            return {
+                "_truncated": True,
+                "_size_bytes": len(entry_str),
+                "preview": entry_str[:max_chars_per_hit],
+            }, True
+    return entry, False
+
+
+def _cluster_cookie(name: str) -> str | None:
+    """Cookie string from a cluster's cookies.<name>.json snapshot, or None."""
+    path = SERVER_DIR / f"cookies.{name}.json"
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    return data.get("cookie") or None
 
-        # Extract total hits
-        hits = result.get("hits", {})
-        total = hits.get("total", 0)
-        if isinstance(total, dict):
-            total = total.get("value", 0)
 
-        # Track what operations the server applied
-        applied_ops = []
+async def _cluster_health_one(client: httpx.AsyncClient, name: str, url: str) -> dict:
+    """Run the health-check request against one cluster, never raising.
 
-        response = {
-            "total_hits": total,
-            "time_range": {"from": time_from, "to": time_to},
+    Failures (no saved cookies, HTTP errors, timeouts) come back as per-
+    cluster error entries so one bad cluster can't sink the whole fan-out.
+    """
+    cookie = _cluster_cookie(name)
+    if cookie is None:
+        return {
+            "cluster": name,
+            "error": f"no saved cookies — run ./get-cookies.py {name} first",
         }
 
-        # If summary_only, return just the count
-        if summary_only:
-            applied_ops.append("summary_only")
-            response["_meta"] = {"applied_operations": applied_ops}
-            return response
-
-        # Process hits
-        simplified_hits = []
-        hits_truncated_count = 0
-        for hit in hits.get("hits", []):
-            source = hit.get("_source", {})
-
-            # Field filtering: if fields specified, extract only those
-            if fields:
-                entry = {}
-                for field in fields:
-                    # Support nested fields like "kubernetes.namespace_name"
-                    value = source
-                    for part in field.split("."):
-                        if isinstance(value, dict):
-                            value = value.get(part)
-                        else:
-                            value = None
-                            break
-                    if value is not None:
-                        entry[field] = value
-            else:
-                # No field filter: include everything but apply auto_prune
-                entry = {
-                    "_index": hit.get("_index"),
-                    "@timestamp": source.get("@timestamp"),
-                }
-                entry.update(source)
-
-                # Auto-prune: remove verbose kubernetes fields
-                if auto_prune and "kubernetes" in entry:
-                    k8s = entry["kubernetes"]
-                    if isinstance(k8s, dict):
-                        k8s.pop("annotations", None)
-                        k8s.pop("labels", None)
-
-            # Truncate if exceeds max_chars_per_hit
-            entry_str = json.dumps(entry, default=str)
-            if len(entry_str) > max_chars_per_hit:
-                entry = {
-                    "_truncated": True,
-                    "_size_bytes": len(entry_str),
-                    "preview": entry_str[:max_chars_per_hit],
-                }
-                hits_truncated_count += 1
-
-            simplified_hits.append(entry)
-
-        # Build metadata about what was applied
-        if fields:
-            applied_ops.append(f"field_filter:{','.join(fields)}")
-        if auto_prune:
-            applied_ops.append("auto_prune:kubernetes.labels,kubernetes.annotations")
-        if hits_truncated_count > 0:
-            applied_ops.append(f"hits_truncated:{hits_truncated_count}/{len(simplified_hits)}")
-        if total > size:
-            applied_ops.append(f"partial_results:{size}_of_{total}")
-
-        response["returned"] = len(simplified_hits)
-        response["hits"] = simplified_hits
+    now = _now_utc()
+    content = (
+        _HEALTH_PAYLOAD_TMPL
+        % (_iso_z(now - timedelta(minutes=1)), _iso_z(now), time.time_ns() // 1_000_000)
+    ).encode()
+    headers = {
+        "Accept": "*/*",
+        "Content-Type": "application/json",
+        "osd-xsrf": "osd-fetch",
+        "osd-version": OSD_VERSION,
+        "Origin": url,
+        "Referer": f"{url}/app/data-explorer/discover",
+        "Cookie": cookie,
+    }
+    try:
+        response = await client.post(
+            f"{url}/internal/search/opensearch-with-long-numerals",
+            content=content,
+            headers=headers,
+        )
+        response.raise_for_status()
+    except httpx.HTTPStatusError as e:
+        return {"cluster": name, "error": f"HTTP {e.response.status_code}"}
+    except httpx.HTTPError as e:
+        return {"cluster": name, "error": str(e) or type(e).__name__}
+
+    parsed = _json_loads(response.content)
+    result = parsed.get("rawResponse", parsed)
+    return {
+        "cluster": name,
+        "docs_in_last_minute": _dig(result, "hits", "total", "value", default="unknown"),
+        "shards": result.get("_shards", {}),
+        "took_ms": result.get("took", "unknown"),
+        "timed_out": result.get("timed_out", False),
+    }
+
+
+# Handler registry: tool name -> async handler(client, arguments). Dict
+# dispatch is O(1) instead of a linear string-compare chain, and gives each
+# handler a natural attachment point for decoration (caching, profiling).
+_HANDLERS: dict[str, Callable] = {}
+
+
+def tool(name: str):
+    """Register an async tool handler under its MCP tool name."""
+    def deco(fn):
+        _HANDLERS[name] = fn
+        return fn
+    return deco
+
+
+@tool("opensearch_search")
+async def _h_search(client: httpx.AsyncClient, arguments: dict[str, Any]) -> Any:
+    index = arguments["index"]
+    query_str = arguments.get("query_string", "")
+    size = min(arguments.get("size", 100), 1000)
+    summary_only = arguments.get("summary_only", False)
+    auto_prune = arguments.get("auto_prune", True)
+    fields = arguments.get("fields")
+    max_chars_per_hit = arguments.get("max_chars_per_hit", 2000)
+
+    # Default time range: last 15 minutes, computed only when needed
+    time_from = arguments.get("time_from")
+    time_to = arguments.get("time_to")
+    if not time_from or not time_to:
+        default_from, default_to = _default_time_range()
+        time_from = time_from or default_from
+        time_to = time_to or default_to
+
+    # For summary_only, we only need count
+    if summary_only:
+        size = 0
+
+    body = build_dashboard_query(
+        query_str=query_str,
+        time_from=time_from,
+        time_to=time_to,
+        size=size,
+    )
+    result = await make_search_request(client, index, body)
+
+    # Extract total hits
+    hits = result.get("hits", {})
+    total = hits.get("total", 0)
+    if isinstance(total, dict):
+        total = total.get("value", 0)
+
+    # Track what operations the server applied
+    applied_ops = []
+
+    response = {
+        "total_hits": total,
+        "time_range": {"from": time_from, "to": time_to},
+    }
+
+    # If summary_only, return just the count
+    if summary_only:
+        applied_ops.append("summary_only")
         response["_meta"] = {"applied_operations": applied_ops}
         return response
 
-    elif name == "opensearch_search_raw":
-        index = arguments["index"]
-        body = arguments["body"]
-        return make_search_request(client, index, body)
-
-    elif name == "opensearch_get_indices":
-        pattern = arguments.get("pattern", "*")
-        now = datetime.now(timezone.utc)
-        time_from = (now - timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
-        time_to = now.strftime("%Y-%m-%dT%H:%M:%S.000Z")
-        body = {
-            "size": 0,
-            "query": {
-                "bool": {
-                    "filter": [{"range": {"@timestamp": {"gte": time_from, "lte": time_to, "format": "strict_date_optional_time"}}}]
-                }
-            },
-            "aggs": {
-                "indices": {
-                    "terms": {
-                        "field": "_index",
-                        "size": 1000
-                    }
+    # Process hits: one _project_hit pass per hit (field filter,
+    # auto-prune and truncation fused), dotted paths split once up front.
+    # The comprehension allocates the result list at its exact size,
+    # avoiding the append/regrow cycle on large responses.
+    split_fields = [(f, f.split(".")) for f in fields] if fields else None
+    projected = [
+        _project_hit(hit, split_fields, auto_prune, max_chars_per_hit)
+        for hit in hits.get("hits", [])
+    ]
+    simplified_hits = [entry for entry, _ in projected]
+    hits_truncated_count = sum(truncated for _, truncated in projected)
+
+    # Build metadata about what was applied
+    if fields:
+        applied_ops.append(f"field_filter:{','.join(fields)}")
+    if auto_prune:
+        applied_ops.append("auto_prune:kubernetes.labels,kubernetes.annotations")
+    if hits_truncated_count > 0:
+        applied_ops.append(f"hits_truncated:{hits_truncated_count}/{len(simplified_hits)}")
+    if total > size:
+        applied_ops.append(f"partial_results:{size}_of_{total}")
+
+    response["returned"] = len(simplified_hits)
+    response["hits"] = simplified_hits
+    response["_meta"] = {"applied_operations": applied_ops}
+    return response
+
+
+@tool("opensearch_search_raw")
+async def _h_search_raw(client: httpx.AsyncClient, arguments: dict[str, Any]) -> Any:
+    index = arguments["index"]
+    body = arguments["body"]
+    return await make_search_request(client, index, body)
+
+
+@tool("opensearch_get_indices")
+async def _h_get_indices(client: httpx.AsyncClient, arguments: dict[str, Any]) -> Any:
+    pattern = arguments.get("pattern", "*")
+    now = _now_utc()
+    time_from = _iso_z(now - timedelta(hours=1))
+    time_to = _iso_z(now)
+    body = {
+        "size": 0,
+        "query": {
+            "bool": {
+                "filter": [{"range": {"@timestamp": {"gte": time_from, "lte": time_to, "format": "strict_date_optional_time"}}}]
+            }
+        },
+        "aggs": {
+            "indices": {
+                "terms": {
+                    "field": "_index",
+                    "size": 1000
                 }
             }
         }
-        result = make_search_request(client, pattern, body)
-        indices = []
-        if "aggregations" in result and "indices" in result["aggregations"]:
-            for bucket in result["aggregations"]["indices"]["buckets"]:
-                indices.append({
-                    "index": bucket["key"],
-                    "doc_count": bucket["doc_count"]
-                })
-        return {
-            "total_indices": len(indices),
-            "time_range": {"from": time_from, "to": time_to},
-            "indices": sorted(indices, key=lambda x: x["doc_count"], reverse=True)
-        }
+    }
+    result = await make_search_request(client, pattern, body)
+    buckets = _dig(result, "aggregations", "indices", "buckets", default=())
+    # Work on compact (key, count) tuples — one itemgetter C call per
+    # bucket — and only build result dicts for the winners, so a 50k-bucket
+    # response never materialises 50k throwaway dicts.
+    pairs = list(map(_bucket_kv, buckets))
+
+    # Only the busiest indices are useful to the caller. For bucket
+    # lists much larger than top_n, nlargest is O(n log top_n) vs the
+    # full O(n log n) sort; itemgetter keeps comparisons in C.
+    top_n = int(arguments.get("top", 50))
+    if len(pairs) > 4 * top_n:
+        top_pairs = heapq.nlargest(top_n, pairs, key=itemgetter(1))
+    else:
+        top_pairs = sorted(pairs, key=itemgetter(1), reverse=True)[:top_n]
+    return {
+        "total_indices": len(pairs),
+        "time_range": {"from": time_from, "to": time_to},
+        "indices": [{"index": key, "doc_count": count} for key, count in top_pairs],
+    }
+
 
-    elif name == "opensearch_get_mappings":
-        index = arguments["index"]
-        now = datetime.now(timezone.utc)
-        time_from = (now - timedelta(minutes=5)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
-        time_to = now.strftime("%Y-%m-%dT%H:%M:%S.000Z")
-        body = build_dashboard_query(query_str="", time_from=time_from, time_to=time_to, size=1)
-        result = make_search_request(client, index, body)
+@tool("opensearch_get_mappings")
+async def _h_get_mappings(client: httpx.AsyncClient, arguments: dict[str, Any]) -> Any:
+    index = arguments["index"]
 
+    # Field shapes rarely change minute-to-minute, so repeat calls on
+    # the same (cluster, index) within the TTL skip the sampling search.
+    cache_key = (str(client.base_url), index)
+    cached = _MAPPINGS_CACHE.get(cache_key)
+    if cached is not None and time.monotonic() - cached[0] < MAPPINGS_CACHE_TTL:
+        return cached[1]
+
+    now = _now_utc()
+    time_from = _iso_z(now - timedelta(minutes=5))
+    time_to = _iso_z(now)
+    body = build_dashboard_query(query_str="", time_from=time_from, time_to=time_to, size=1)
+
+    fields = None
+    if ijson is not None:
+        try:
+            sample = await _stream_first_hit_source(client, index, body)
+        except ijson.common.JSONError:
+            # e.g. "integer overflow": the long-numerals endpoint can carry
+            # ints wider than 64 bits, which ijson rejects — re-fetch below.
+            pass
+        else:
+            fields = _extract_fields(sample) if sample else {}
+    if fields is None:
+        result = await make_search_request(client, index, body)
         fields = {}
-        if result.get("hits", {}).get("hits"):
+        if _dig(result, "hits", "hits"):
             sample = result["hits"]["hits"][0].get("_source", {})
-            def extract_fields(obj, prefix=""):
-                for key, value in obj.items():
-                    full_key = f"{prefix}.{key}" if prefix else key
-                    if isinstance(value, dict):
-                        extract_fields(value, full_key)
-                    elif isinstance(value, list):
-                        fields[full_key] = f"list ({type(value[0]).__name__ if value else 'empty'})"
-                    else:
-                        fields[full_key] = type(value).__name__
-            extract_fields(sample)
+            fields = _extract_fields(sample)
 
-        return {
-            "index": index,
-            "fields": fields,
-        }
+    response = {
+        "index": index,
+        "fields": fields,
+    }
+    if len(_MAPPINGS_CACHE) >= _MAPPINGS_CACHE_MAX:
+        # Drop the oldest insertion to bound memory across many indices
+        _MAPPINGS_CACHE.pop(next(iter(_MAPPINGS_CACHE)))
+    _MAPPINGS_CACHE[cache_key] = (time.monotonic(), response)
+    return response
 
-    elif name == "opensearch_aggregate":
-        index = arguments["index"]
-        body = {
-            "size": arguments.get("size", 0),
-            "aggs": arguments["aggs"],
-        }
-        if "query" in arguments:
-            body["query"] = arguments["query"]
-        return make_search_request(client, index, body)
-
-    elif name == "opensearch_cluster_health":
-        now = datetime.now(timezone.utc)
-        time_from = (now - timedelta(minutes=1)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
-        time_to = now.strftime("%Y-%m-%dT%H:%M:%S.000Z")
-        body = {
-            "size": 0,
-            "query": {
-                "bool": {
-                    "filter": [{"range": {"@timestamp": {"gte": time_from, "lte": time_to, "format": "strict_date_optional_time"}}}]
-                }
-            }
-        }
-        result = make_search_request(client, "*", body)
-        return {
-            "docs_in_last_minute": result.get("hits", {}).get("total", {}).get("value", "unknown"),
-            "shards": result.get("_shards", {}),
-            "took_ms": result.get("took", "unknown"),
-            "timed_out": result.get("timed_out", False),
-        }
 
-    else:
+@tool("opensearch_aggregate")
+async def _h_aggregate(client: httpx.AsyncClient, arguments: dict[str, Any]) -> Any:
+    index = arguments["index"]
+    q = arguments.get("query")
+    body = {
+        "size": arguments.get("size", 0),
+        "aggs": arguments["aggs"],
+    }
+    if q is not None:
+        body["query"] = q
+    return await make_search_request(client, index, body)
+
+
+@tool("opensearch_cluster_health")
+async def _h_cluster_health(client: httpx.AsyncClient, arguments: dict[str, Any]) -> Any:
+    now = _now_utc()
+    time_from = _iso_z(now - timedelta(minutes=1))
+    time_to = _iso_z(now)
+    content = (_HEALTH_PAYLOAD_TMPL % (time_from, time_to, time.time_ns() // 1_000_000)).encode()
+    response = await client.post("/internal/search/opensearch-with-long-numerals", content=content)
+    response.raise_for_status()
+    parsed = _json_loads(response.content)
+    result = parsed.get("rawResponse", parsed)
+    return {
+        "docs_in_last_minute": _dig(result, "hits", "total", "value", default="unknown"),
+        "shards": result.get("_shards", {}),
+        "took_ms": result.get("took", "unknown"),
+        "timed_out": result.get("timed_out", False),
+    }
+
+
+@tool("opensearch_cluster_health_all")
+async def _h_cluster_health_all(client: httpx.AsyncClient, arguments: dict[str, Any]) -> Any:
+    # Fan out concurrently: total latency is the slowest cluster,
+    # not the sum. Absolute URLs and per-request headers override the
+    # shared client's active-cluster configuration.
+    results = await asyncio.gather(*(
+        _cluster_health_one(client, cluster_name, c.url.rstrip("/"))
+        for cluster_name, c in ACTIVE_CLUSTERS.items()
+    ))
+    return {"clusters": list(results)}
+
+
+async def execute_tool(client: httpx.AsyncClient, name: str, arguments: dict[str, Any]) -> Any:
+    """Execute the specified tool and return results."""
+    handler = _HANDLERS.get(name)
+    if handler is None:
         raise ValueError(f"Unknown tool: {name}")
+    return await handler(client, arguments)
 
 
 async def main():
@@ -855,10 +1471,13 @@ async def main():
     if not OPENSEARCH_COOKIE and not COOKIES_FILE.exists():
         print("Warning: No cookies configured. Set OPENSEARCH_COOKIE env var or run get-cookies.py.", file=sys.stderr)
 
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, server.create_initialization_options())
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, server.create_initialization_options())
+    finally:
+        await close_client()
+        await close_browser()
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())